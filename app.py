@@ -1,4 +1,9 @@
 from src.storage import save_valuation
+from src.memory_governor import (
+    MemoryGovernor,
+    budget_from_config,
+    estimate_frame_nbytes,
+)
 from datetime import datetime, timezone
 import streamlit as st
 import pandas as pd
@@ -8,6 +13,7 @@ from pathlib import Path
 import hashlib
 from streamlit_star_rating import st_star_rating
 import uuid
+import os
 
 ## Debug checks (confirms Supabase secrets are loaded at runtime)
 # st.write("Supabase URL loaded:", bool(st.secrets.get("SUPABASE_URL")))
@@ -85,6 +91,10 @@ if "calculate_scores" not in st.session_state:
 if "saved_submit_id" not in st.session_state:
     st.session_state["saved_submit_id"] = None
 
+# Identifies this session in the shared memory governor
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = str(uuid.uuid4())
+
 # Value Dimentions
 value_dimensions = [
     "Economic",
@@ -140,8 +150,9 @@ tooltips = {
 # -----------------------------
 # Signature for uploaded dataset, if different content with same name/size
 def file_signature(uploaded_file) -> str:
-    data = uploaded_file.getvalue()
-    h = hashlib.md5(data).hexdigest()
+    # Hash the upload buffer in place instead of copying the bytes
+    with uploaded_file.getbuffer() as data:
+        h = hashlib.md5(data).hexdigest()
     return f"{uploaded_file.name}-{uploaded_file.size}-{h}"
 
 
@@ -190,6 +201,19 @@ def reset_ratings_only():
     st.session_state["ratings_nonce"] += 1  # remount star components to defaultValue 0
 
 
+# Create and cache one memory governor shared by all sessions
+@st.cache_resource
+def get_memory_governor() -> MemoryGovernor:
+    budget_mb = os.environ.get("MEMORY_BUDGET_MB")
+    if budget_mb is None:
+        try:
+            budget_mb = st.secrets.get("MEMORY_BUDGET_MB")
+        except Exception:
+            # No secrets.toml available (e.g. local run)
+            budget_mb = None
+    return MemoryGovernor(budget_from_config(budget_mb))
+
+
 def star_string(score: float, max_stars: int = 5) -> str:
     s = int(round(score))
     s = max(0, min(max_stars, s))
@@ -208,7 +232,11 @@ uploaded_file = st.file_uploader(
     on_change=reset_dependent_state,  # added the helper function on change
 )
 
+governor = get_memory_governor()
+session_id = st.session_state["session_id"]
+
 if not uploaded_file:
+    governor.forget(session_id)
     st.info("Upload a CSV/XLSX/XLS file to begin.")
     st.stop()
 
@@ -216,34 +244,61 @@ if not uploaded_file:
 sig = file_signature(uploaded_file)
 st.session_state["dataset_sig"] = sig
 
-# Read file
-name = uploaded_file.name.lower()
+# Check the upload fits in the global memory budget before parsing it
+memory_error = (
+    "The server is short on memory. Please try again later or upload a smaller file."
+)
+if not governor.track_upload(session_id, sig, uploaded_file.size):
+    st.error(memory_error)
+    st.stop()
+
+# Reserve memory for the parsed frame while this run uses it
+run_id = str(uuid.uuid4())
+if not governor.reserve_frame(run_id, estimate_frame_nbytes(uploaded_file.size)):
+    st.error(memory_error)
+    st.stop()
+
 try:
+    # Read file
+    name = uploaded_file.name.lower()
+    try:
+
+        if name.endswith(".csv"):
+            df = pd.read_csv(uploaded_file)
+        elif name.endswith(".xlsx"):
+            df = pd.read_excel(uploaded_file, engine="openpyxl")
+        elif name.endswith(".xls"):
+            df = pd.read_excel(uploaded_file)
+        else:
+            st.error("Unsupported file type")
+            st.stop()
+    except Exception as e:
+        st.error(f"Failed to reaf file: {e}")
+        st.stop()
 
-    if name.endswith(".csv"):
-        df = pd.read_csv(uploaded_file)
-    elif name.endswith(".xlsx"):
-        df = pd.read_excel(uploaded_file, engine="openpyxl")
-    elif name.endswith(".xls"):
-        df = pd.read_excel(uploaded_file)
-    else:
-        st.error("Unsupported file type")
+    # Replace the estimate with the measured size of the parsed frame
+    if not governor.reserve_frame(run_id, df.memory_usage(deep=True).sum()):
+        st.error(memory_error)
         st.stop()
-except Exception as e:
-    st.error(f"Failed to reaf file: {e}")
-    st.stop()
 
-# Show Preview
-st.subheader("Data Preview")
-df_preview = df.copy()
-df_preview.index = df.index + 1
-st.dataframe(df_preview.head(), width="stretch")
-
-# Evaluate dataset quality
-st.subheader("Data Quality Overview:")
-dq = DatasetQualityValuator(df)
-quality = dq.score()
-st.json(quality)
+    # Show Preview (only the first rows, not a copy of the whole frame)
+    st.subheader("Data Preview")
+    df_preview = df.head()
+    df_preview.index = df_preview.index + 1
+    st.dataframe(df_preview, width="stretch")
+
+    # Evaluate dataset quality
+    st.subheader("Data Quality Overview:")
+    quality = governor.get_result(session_id, sig, "quality")
+    if quality is None:
+        dq = DatasetQualityValuator(df)
+        quality = dq.score()
+        governor.put_result(session_id, sig, "quality", quality)
+    st.json(quality)
+finally:
+    # The full frame is not needed past this point
+    df = dq = None
+    governor.release_frame(run_id)
 
 # -----------------------------
 # 2. SELECT USE CASE
@@ -0,0 +1,206 @@
+import copy
+import sys
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+# Default global budget when MEMORY_BUDGET_MB is not configured
+DEFAULT_BUDGET_MB = 256
+# Sessions not seen for this long are treated as closed
+DEFAULT_SESSION_TTL_SECONDS = 5 * 60
+# Rough parsed DataFrame size per byte of upload, used before parsing
+FRAME_SIZE_FACTOR = 5
+
+
+# Memory that stays alive for one session between reruns
+@dataclass
+class SessionEntry:
+    dataset_sig: str
+    raw_bytes: int
+    last_seen: float
+    results: Dict[str, Any] = field(default_factory=dict)
+    results_bytes: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.raw_bytes + self.results_bytes
+
+    def drop_results(self) -> None:
+        self.results = {}
+        self.results_bytes = 0
+
+
+def value_nbytes(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            value_nbytes(k) + value_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(value_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def estimate_frame_nbytes(raw_bytes: int) -> int:
+    return int(raw_bytes) * FRAME_SIZE_FACTOR
+
+
+# Process-wide tracker of session memory against one global budget:
+# - raw upload bytes, held by Streamlit between reruns
+# - small cached results (the quality overview)
+# - in-flight parsed DataFrames, reserved for the duration of a rerun
+#
+# Upload bytes cannot be evicted or spilled from here - Streamlit owns them
+# and frees them when the session ends. The budget therefore works as
+# admission control: an upload or a parse that does not fit is rejected
+# (and not counted), and can be retried once memory frees up. Cached
+# results are the only evictable data and are dropped least recently used
+# first.
+class MemoryGovernor:
+    def __init__(
+        self,
+        budget_bytes: int,
+        ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.budget_bytes = int(budget_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._sessions: "OrderedDict[str, SessionEntry]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def used_bytes(self) -> int:
+        with self._lock:
+            self._sweep_expired()
+            return self._total()
+
+    # Register the raw upload of a session. Returns False (and does not count
+    # it) if it does not fit in the budget; the check is repeated every call.
+    def track_upload(self, session_id: str, dataset_sig: str, raw_bytes: int) -> bool:
+        with self._lock:
+            self._sweep_expired(keep=session_id)
+
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.dataset_sig != dataset_sig:
+                # New dataset for this session - replaces the previous entry
+                self._sessions.pop(session_id, None)
+                raw_bytes = int(raw_bytes)
+                if not self._make_room(raw_bytes):
+                    return False
+                entry = SessionEntry(
+                    dataset_sig=dataset_sig,
+                    raw_bytes=raw_bytes,
+                    last_seen=self._clock(),
+                )
+                self._sessions[session_id] = entry
+
+            self._touch(session_id, dataset_sig)
+            return True
+
+    # Stop tracking a session whose upload was removed
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    # Reserve (or resize) the in-flight DataFrame of one script run.
+    # Returns False and holds nothing if it does not fit.
+    def reserve_frame(self, run_id: str, nbytes: int) -> bool:
+        with self._lock:
+            self._sweep_expired()
+            self._in_flight.pop(run_id, None)
+            nbytes = int(nbytes)
+            if not self._make_room(nbytes):
+                return False
+            self._in_flight[run_id] = nbytes
+            return True
+
+    def release_frame(self, run_id: str) -> None:
+        with self._lock:
+            self._in_flight.pop(run_id, None)
+
+    # Cached results are returned as copies, so callers cannot change them
+    def get_result(self, session_id: str, dataset_sig: str, key: str) -> Any:
+        with self._lock:
+            entry = self._touch(session_id, dataset_sig)
+            if entry is None or key not in entry.results:
+                return None
+            return copy.deepcopy(entry.results[key])
+
+    def put_result(self, session_id: str, dataset_sig: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._sweep_expired(keep=session_id)
+            entry = self._touch(session_id, dataset_sig)
+            if entry is None:
+                return
+            entry.results.pop(key, None)
+            entry.results_bytes = sum(value_nbytes(v) for v in entry.results.values())
+
+            nbytes = value_nbytes(value)
+            if self._make_room(nbytes, keep=session_id):
+                entry.results[key] = copy.deepcopy(value)
+                entry.results_bytes += nbytes
+
+    # Mark session as most recently used; None if its dataset is not tracked
+    def _touch(self, session_id: str, dataset_sig: str) -> Optional[SessionEntry]:
+        entry = self._sessions.get(session_id)
+        if entry is None or entry.dataset_sig != dataset_sig:
+            return None
+        entry.last_seen = self._clock()
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def _total(self) -> int:
+        return sum(e.nbytes for e in self._sessions.values()) + sum(
+            self._in_flight.values()
+        )
+
+    # Drop cached results, least recently used first, until nbytes more fit
+    def _make_room(self, nbytes: int, keep: Optional[str] = None) -> bool:
+        limit = self.budget_bytes - nbytes
+        evictable = sum(
+            e.results_bytes for sid, e in self._sessions.items() if sid != keep
+        )
+        if self._total() - evictable > limit:
+            # Evicting would not be enough - keep other sessions' results
+            return False
+        for sid, entry in self._sessions.items():
+            if self._total() <= limit:
+                break
+            if sid != keep:
+                entry.drop_results()
+        return self._total() <= limit
+
+    # Forget sessions not seen within the TTL (Streamlit releases their
+    # uploads when the session ends)
+    def _sweep_expired(self, keep: Optional[str] = None) -> None:
+        now = self._clock()
+        expired = [
+            sid
+            for sid, entry in self._sessions.items()
+            if sid != keep and now - entry.last_seen > self.ttl_seconds
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+
+
+# Parse MEMORY_BUDGET_MB into bytes; invalid values fall back to the default
+def budget_from_config(budget_mb: Any) -> int:
+    default = DEFAULT_BUDGET_MB * 1024 * 1024
+    if budget_mb is None or budget_mb == "":
+        return default
+    try:
+        value = float(budget_mb)
+    except (TypeError, ValueError):
+        value = None
+    if value is None or not value > 0 or value == float("inf"):
+        warnings.warn(
+            f"Invalid MEMORY_BUDGET_MB {budget_mb!r}, "
+            f"using default of {DEFAULT_BUDGET_MB} MB"
+        )
+        return default
+    return int(value * 1024 * 1024)
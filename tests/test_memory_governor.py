@@ -0,0 +1,225 @@
+import pytest
+
+from src.memory_governor import (
+    DEFAULT_BUDGET_MB,
+    FRAME_SIZE_FACTOR,
+    MemoryGovernor,
+    budget_from_config,
+    estimate_frame_nbytes,
+)
+
+MB = 1024 * 1024
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_governor(budget_bytes, ttl_seconds=60):
+    clock = FakeClock()
+    return MemoryGovernor(budget_bytes, ttl_seconds=ttl_seconds, clock=clock), clock
+
+
+# Uploads
+
+
+def test_upload_within_budget_is_accepted_and_counted():
+    gov, _ = make_governor(1000)
+    assert gov.track_upload("a", "sig", 400)
+    assert gov.used_bytes() == 400
+
+
+def test_rejected_upload_is_not_counted():
+    gov, _ = make_governor(1000)
+    assert gov.track_upload("a", "sig", 600)
+    assert not gov.track_upload("b", "sig", 600)
+    assert gov.used_bytes() == 600
+
+    # A rejected upload does not block smaller ones
+    assert gov.track_upload("c", "sig", 100)
+    assert gov.used_bytes() == 700
+
+
+def test_rejected_upload_is_accepted_on_rerun_once_memory_frees():
+    gov, _ = make_governor(1000)
+    gov.track_upload("a", "sig", 600)
+    assert not gov.track_upload("b", "sig", 600)
+
+    gov.forget("a")
+    assert gov.track_upload("b", "sig", 600)
+    assert gov.used_bytes() == 600
+
+
+def test_accepted_upload_is_never_evicted():
+    gov, _ = make_governor(1000)
+    gov.track_upload("a", "sig", 900)
+    assert not gov.track_upload("b", "sig", 200)
+    assert not gov.reserve_frame("run", 200)
+
+    # The budget only admits or rejects - "a" keeps its upload
+    assert gov.track_upload("a", "sig", 900)
+    assert gov.used_bytes() == 900
+
+
+def test_new_signature_replaces_session_entry():
+    gov, _ = make_governor(1000)
+    gov.track_upload("a", "old", 500)
+    gov.put_result("a", "old", "quality", b"x" * 100)
+
+    assert gov.track_upload("a", "new", 800)
+    assert gov.get_result("a", "old", "quality") is None
+    assert gov.get_result("a", "new", "quality") is None
+    assert gov.used_bytes() == 800
+
+
+# In-flight frames
+
+
+def test_frame_reservation_counts_until_released():
+    gov, _ = make_governor(1000)
+    gov.track_upload("a", "sig", 100)
+    assert gov.reserve_frame("run", 500)
+    assert gov.used_bytes() == 600
+
+    gov.release_frame("run")
+    assert gov.used_bytes() == 100
+
+
+def test_frame_reservation_can_be_resized():
+    gov, _ = make_governor(1000)
+    assert gov.reserve_frame("run", 500)
+    assert gov.reserve_frame("run", 900)
+    assert gov.used_bytes() == 900
+
+
+def test_concurrent_frames_over_budget_are_rejected():
+    gov, _ = make_governor(1000)
+    assert gov.reserve_frame("run1", 600)
+    assert not gov.reserve_frame("run2", 600)
+    assert gov.used_bytes() == 600
+
+    gov.release_frame("run1")
+    assert gov.reserve_frame("run2", 600)
+
+
+def test_failed_resize_releases_reservation():
+    gov, _ = make_governor(1000)
+    assert gov.reserve_frame("run", 500)
+    assert not gov.reserve_frame("run", 1500)
+    assert gov.used_bytes() == 0
+
+
+def test_estimate_frame_nbytes():
+    assert estimate_frame_nbytes(100) == 100 * FRAME_SIZE_FACTOR
+
+
+# Cached results
+
+
+def test_results_are_copied_in_and_out():
+    gov, _ = make_governor(10_000)
+    gov.track_upload("a", "sig", 100)
+    quality = {"rows": 1}
+    gov.put_result("a", "sig", "quality", quality)
+
+    quality["rows"] = 2
+    cached = gov.get_result("a", "sig", "quality")
+    assert cached == {"rows": 1}
+
+    cached["rows"] = 3
+    assert gov.get_result("a", "sig", "quality") == {"rows": 1}
+
+
+def test_least_recently_used_results_are_evicted_first():
+    gov, _ = make_governor(650)
+    for sid in ("a", "b", "c"):
+        gov.track_upload(sid, "sig", 100)
+        gov.put_result(sid, "sig", "quality", b"x" * 100)
+    assert gov.used_bytes() == 600
+
+    # Touch "a" so "b" becomes the least recently used
+    gov.get_result("a", "sig", "quality")
+    assert gov.track_upload("d", "sig", 100)
+
+    assert gov.get_result("b", "sig", "quality") is None
+    assert gov.get_result("a", "sig", "quality") == b"x" * 100
+    assert gov.get_result("c", "sig", "quality") == b"x" * 100
+    assert gov.used_bytes() == 600
+
+
+def test_results_kept_when_eviction_would_not_help():
+    gov, _ = make_governor(700)
+    gov.track_upload("a", "sig", 100)
+    gov.put_result("a", "sig", "quality", b"x" * 100)
+
+    assert not gov.track_upload("b", "sig", 700)
+    assert gov.get_result("a", "sig", "quality") == b"x" * 100
+
+
+def test_current_session_results_not_kept_when_over_budget():
+    gov, _ = make_governor(150)
+    gov.track_upload("a", "sig", 100)
+    gov.put_result("a", "sig", "quality", b"x" * 100)
+
+    assert gov.get_result("a", "sig", "quality") is None
+    assert gov.used_bytes() == 100
+
+
+def test_rejected_session_does_not_cache_results():
+    gov, _ = make_governor(1000)
+    gov.track_upload("a", "sig", 600)
+    gov.track_upload("b", "sig", 600)
+    gov.put_result("b", "sig", "quality", b"x" * 10)
+    assert gov.get_result("b", "sig", "quality") is None
+
+
+# Session expiry
+
+
+def test_expired_sessions_are_swept_on_upload():
+    gov, clock = make_governor(1000, ttl_seconds=60)
+    gov.track_upload("a", "sig", 600)
+    clock.now = 30
+    gov.track_upload("b", "sig", 300)
+
+    clock.now = 61
+    assert gov.track_upload("c", "sig", 600)
+    assert gov.used_bytes() == 900
+
+
+def test_expired_sessions_are_swept_on_used_bytes_and_put_result():
+    gov, clock = make_governor(1000, ttl_seconds=60)
+    gov.track_upload("a", "sig", 600)
+    clock.now = 61
+    assert gov.used_bytes() == 0
+
+    gov.track_upload("b", "sig", 600)
+    clock.now = 62
+    gov.track_upload("c", "sig", 100)
+    # "b" expires before "c" - put_result sweeps it before checking room
+    clock.now = 122
+    gov.put_result("c", "sig", "quality", b"x" * 800)
+    assert gov.get_result("c", "sig", "quality") == b"x" * 800
+
+
+# Configuration
+
+
+def test_budget_from_config_parses_megabytes():
+    assert budget_from_config("64") == 64 * MB
+    assert budget_from_config(0.5) == MB // 2
+
+
+def test_budget_from_config_unset_uses_default():
+    assert budget_from_config(None) == DEFAULT_BUDGET_MB * MB
+    assert budget_from_config("") == DEFAULT_BUDGET_MB * MB
+
+
+@pytest.mark.parametrize("value", ["lots", "0", -5, "nan", "inf"])
+def test_budget_from_config_rejects_invalid_values(value):
+    with pytest.warns(UserWarning, match="MEMORY_BUDGET_MB"):
+        assert budget_from_config(value) == DEFAULT_BUDGET_MB * MB